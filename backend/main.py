@@ -4,13 +4,30 @@ application, configures middleware, and registers routers. The app can
 be run with `uvicorn backend.main:app --reload` during development.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .routes import chat
+from .services import news_service
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the pooled connections to the ollama server on shutdown.
+    await news_service.close_client()
 
-app = FastAPI(title="Latest News Agent")
+
+# orjson encodes the JSON responses of every endpoint, which is cheaper
+# than the standard library encoder FastAPI uses by default.
+app = FastAPI(
+    title="Latest News Agent",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Allow the frontend to communicate with the backend. In a production
 # setting these origins should be restricted to known domains.
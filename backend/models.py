@@ -11,19 +11,36 @@ sufficient.
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 
+# Preference keys in question order. These map to the five questions
+# defined in services.QUESTIONS.
+_PREF_KEYS: Tuple[str, ...] = (
+    "tone_of_voice",
+    "response_format",
+    "language",
+    "interaction_style",
+    "news_topics",
+)
+
+
 @dataclass
 class Message:
     """Represents a single chat message.
 
     role: "user" or "assistant".
     content: the textual content of the message.
+
+    Messages are kept for the lifetime of a session, so `__slots__` is
+    used to avoid a per-instance `__dict__`.
     """
 
+    __slots__ = ("role", "content")
+
     role: str
     content: str
 
@@ -40,21 +57,20 @@ class Session:
     """
 
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    preferences: Dict[str, Optional[str]] = field(default_factory=lambda: {
-        "tone_of_voice": None,
-        "response_format": None,
-        "language": None,
-        "interaction_style": None,
-        "news_topics": None,
-    })
+    preferences: Dict[str, Optional[str]] = field(
+        default_factory=lambda: dict.fromkeys(_PREF_KEYS)
+    )
     conversation: List[Message] = field(default_factory=list)
     # Index of the next question to ask. Range 0‑4 inclusive. When
     # question_index == len(QUESTIONS), all preferences are collected.
     question_index: int = 0
+    # Number of preferences holding a non-empty answer, maintained by
+    # record_answer so is_complete does not have to scan the dict.
+    _filled_count: int = field(default=0, init=False, repr=False)
 
     def is_complete(self) -> bool:
         """Return True if all preferences have been filled."""
-        return all(v for v in self.preferences.values())
+        return self._filled_count == len(_PREF_KEYS)
 
     def record_answer(self, answer: str) -> None:
         """Record the user's answer to the current question.
@@ -63,12 +79,20 @@ class Session:
         key based on the current question index and then advance the
         question pointer.
         """
-        keys = list(self.preferences.keys())
-        if self.question_index < len(keys):
-            key = keys[self.question_index]
-            self.preferences[key] = answer.strip()
+        if self.question_index < len(_PREF_KEYS):
+            key = _PREF_KEYS[self.question_index]
+            value = answer.strip()
+            if value and not self.preferences[key]:
+                self._filled_count += 1
+            self.preferences[key] = value
             self.question_index += 1
 
+    def reset_preferences(self) -> None:
+        """Clear all preferences and restart the question flow."""
+        self.preferences = dict.fromkeys(_PREF_KEYS)
+        self.question_index = 0
+        self._filled_count = 0
+
     def next_question(self) -> Optional[str]:
         """Return the next question text, or None if complete."""
         from .services import QUESTIONS
@@ -80,19 +104,29 @@ class Session:
 class SessionStore:
     """A simple in‑memory store for sessions.
 
-    Keys are session ids and values are Session objects.
+    Keys are session ids and values are Session objects. The store is
+    bounded: once `max_sessions` is reached the least recently used
+    session is evicted. No lock is needed: the routes run on the event
+    loop and none of these methods awaits, so each call completes
+    without interleaving with another request.
     """
 
-    def __init__(self) -> None:
-        self._sessions: Dict[str, Session] = {}
+    def __init__(self, max_sessions: int = 10_000) -> None:
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._max_sessions = max_sessions
 
     def create(self) -> Session:
         session = Session()
         self._sessions[session.id] = session
+        while len(self._sessions) > self._max_sessions:
+            self._sessions.popitem(last=False)
         return session
 
     def get(self, session_id: str) -> Optional[Session]:
-        return self._sessions.get(session_id)
+        session = self._sessions.get(session_id)
+        if session:
+            self._sessions.move_to_end(session_id)
+        return session
 
     def reset(self, session_id: str) -> Optional[Session]:
         """Reset the session preferences and question index.
@@ -100,14 +134,7 @@ class SessionStore:
         Conversation history is left intact. To completely clear a
         session remove it from the store and create a new one.
         """
-        session = self._sessions.get(session_id)
+        session = self.get(session_id)
         if session:
-            session.preferences = {
-                "tone_of_voice": None,
-                "response_format": None,
-                "language": None,
-                "interaction_style": None,
-                "news_topics": None,
-            }
-            session.question_index = 0
+            session.reset_preferences()
         return session
\ No newline at end of file
@@ -7,12 +7,14 @@ interaction.
 
 from __future__ import annotations
 
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from ..models import Message, Session, SessionStore
-from ..services.news_service import generate_news_response
+from ..services.news_service import generate_news_response, stream_news_response
 from ..services import QUESTIONS
 
 
@@ -20,6 +22,10 @@ router = APIRouter(prefix="/session")
 
 session_store = SessionStore()
 
+# Commands that ask for another batch of articles. Matched against the
+# whole, lower‑cased user message.
+MORE_COMMANDS = frozenset({"more", "next", "another"})
+
 
 class CreateSessionResponse(BaseModel):
     session_id: str
@@ -49,6 +55,14 @@ async def create_session() -> CreateSessionResponse:
     return CreateSessionResponse(session_id=session.id, message=first_question)
 
 
+def _reply(session: Session, text: Optional[str], complete: bool) -> ChatResponse:
+    """Record the assistant reply, if any, and build the response."""
+    if not text:
+        return ChatResponse(responses=[], preferences_complete=complete, preferences=session.preferences)
+    session.conversation.append(Message(role="assistant", content=text))
+    return ChatResponse(responses=[text], preferences_complete=complete, preferences=session.preferences)
+
+
 @router.post("/{session_id}/message", response_model=ChatResponse)
 async def chat(session_id: str, request: ChatRequest) -> ChatResponse:
     """Handle a user message for a given session.
@@ -64,49 +78,57 @@ async def chat(session_id: str, request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=404, detail="Session not found")
 
     user_input = request.message.strip()
+    command = user_input.lower()
     session.conversation.append(Message(role="user", content=user_input))
 
-    responses: List[str] = []
     # Handle special commands
-    if user_input.lower() == "reset":
+    if command == "reset":
         session_store.reset(session_id)
-        next_q = session.next_question()
-        if next_q:
-            responses.append(next_q)
-            session.conversation.append(Message(role="assistant", content=next_q))
-        return ChatResponse(responses=responses, preferences_complete=False, preferences=session.preferences)
-    if user_input.lower() in {"more", "next", "another"}:
+        return _reply(session, session.next_question(), complete=False)
+    if command in MORE_COMMANDS:
         # Provide more news items using existing preferences
         if session.is_complete():
-            news = generate_news_response(session.preferences)
-            responses.append(news)
-            session.conversation.append(Message(role="assistant", content=news))
-            return ChatResponse(responses=responses, preferences_complete=True, preferences=session.preferences)
-        else:
-            # Not ready yet: prompt next question
-            next_q = session.next_question()
-            if next_q:
-                responses.append(next_q)
-                session.conversation.append(Message(role="assistant", content=next_q))
-            return ChatResponse(responses=responses, preferences_complete=False, preferences=session.preferences)
+            news = await generate_news_response(session.preferences)
+            return _reply(session, news, complete=True)
+        # Not ready yet: prompt next question
+        return _reply(session, session.next_question(), complete=False)
 
     # If preferences not complete, record answer and ask next question
     if not session.is_complete():
         session.record_answer(user_input)
         next_q = session.next_question()
         if next_q:
-            responses.append(next_q)
-            session.conversation.append(Message(role="assistant", content=next_q))
-            return ChatResponse(responses=responses, preferences_complete=False, preferences=session.preferences)
+            return _reply(session, next_q, complete=False)
         # All preferences collected after this answer
-        news = generate_news_response(session.preferences)
-        responses.append(news)
-        session.conversation.append(Message(role="assistant", content=news))
-        return ChatResponse(responses=responses, preferences_complete=True, preferences=session.preferences)
+        news = await generate_news_response(session.preferences)
+        return _reply(session, news, complete=True)
 
     # At this point preferences are complete. Any other input is
     # treated as a request for more articles.
-    news = generate_news_response(session.preferences)
-    responses.append(news)
-    session.conversation.append(Message(role="assistant", content=news))
-    return ChatResponse(responses=responses, preferences_complete=True, preferences=session.preferences)
\ No newline at end of file
+    news = await generate_news_response(session.preferences)
+    return _reply(session, news, complete=True)
+
+
+@router.post("/{session_id}/news")
+async def stream_news(session_id: str) -> StreamingResponse:
+    """Stream news summaries for a session as they are generated.
+
+    Each summary is sent as one JSON line, `{"summary": "..."}`, as soon
+    as it is ready instead of waiting for the whole batch as the message
+    endpoint does. Preferences must already be complete. The combined
+    text is added to the conversation history once the stream ends.
+    """
+    session = session_store.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if not session.is_complete():
+        raise HTTPException(status_code=409, detail="Preferences are not complete")
+
+    async def lines() -> AsyncIterator[bytes]:
+        summaries: List[str] = []
+        async for summary in stream_news_response(session.preferences):
+            summaries.append(summary)
+            yield orjson.dumps({"summary": summary}) + b"\n"
+        session.conversation.append(Message(role="assistant", content="\n\n".join(summaries)))
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
\ No newline at end of file
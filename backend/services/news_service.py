@@ -3,26 +3,89 @@ News service providing dummy articles and formatting them according to
 user preferences. In a real system this module would integrate with
 third‑party APIs such as Exa for fetching live news and another model
 for summarisation and tone adaptation. For this exercise we rely on
-local data and optionally call a locally installed `ollama` command
-with the Phi3 model to tailor responses. If the `ollama` binary is
-unavailable the service falls back to simple string manipulations.
+local data and optionally call a local `ollama` server with the Phi3
+model to tailor responses. If no ollama server is configured (see
+`has_ollama`) the service falls back to simple string manipulations.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
+import logging
 import os
 import random
+import re
 import shutil
-import subprocess
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+import httpx
 
 from . import QUESTIONS
 
 
+logger = logging.getLogger(__name__)
+
+# Matches the "[i]:" markers that open each summary in a batched model
+# response.
+_BATCH_ITEM_RE = re.compile(r"^\s*\[(\d+)\]:", re.MULTILINE)
+
+# Matches one sentence for the bullet-point fallback: the text without
+# surrounding whitespace and its closing punctuation, if any.
+_SENTENCE_RE = re.compile(r"\s*([^.!?]*[^.!?\s])\s*([.!?]?)")
+
+# Constant parts of the model prompts, built once at import.
+_PROMPT_PREFIX = "You are a helpful assistant tasked with rewriting news articles.\n"
+_BATCH_PROMPT_SUFFIX = (
+    "Provide one summary per article in the form \"[i]: <summary>\", "
+    "where i is the article number.\n\n"
+    "Summaries:"
+)
+
+# Prompt templates, filled with `str.format`. The values are inserted
+# verbatim, so braces in user input or article text are harmless.
+_ARTICLE_PROMPT = (
+    _PROMPT_PREFIX
+    + "Please summarise the following news article in {language}.\n"
+    "Use a {tone} tone and make the summary {interaction_style}.\n"
+    "Present the response as {response_format}.\n\n"
+    "Title: {title}\n"
+    "Description: {description}\n"
+    "Topics: {topics}\n\n"
+    "Summary:"
+)
+_BATCH_PROMPT = (
+    _PROMPT_PREFIX
+    + "Please summarise each of the following news articles in {language}.\n"
+    "Use a {tone} tone and make each summary {interaction_style}.\n"
+    "Present each response as {response_format}.\n\n"
+    "{items}\n\n"
+    + _BATCH_PROMPT_SUFFIX
+)
+
+# Base URL of the ollama HTTP API. `ollama serve` listens here by default.
+OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://127.0.0.1:11434")
+
+# Shared client so calls reuse keep-alive connections to the ollama
+# server. Created on first use and closed by `close_client`.
+_client: Optional[httpx.AsyncClient] = None
+
+# Model-generated summaries keyed by article and preferences, so the
+# same article is not rewritten twice for the same settings. Evicts the
+# least recently used entry beyond `_SUMMARY_CACHE_SIZE`.
+_SUMMARY_CACHE_SIZE = 512
+_summary_cache: OrderedDict[str, str] = OrderedDict()
+
 # Dummy news database. Each entry has a title, description and a set
-# of tags. Feel free to extend this list to provide more variety.
-DUMMY_NEWS: List[Dict[str, str]] = [
+# of tags. Feel free to extend this list to provide more variety. The
+# entries are read-only views so they can be handed out without copying.
+DUMMY_NEWS: Tuple[Mapping[str, str], ...] = tuple(MappingProxyType(d) for d in (
     {
         "title": "Breakthrough in Quantum Computing",
         "description": "Scientists have achieved a major milestone in quantum computing by demonstrating a 100‑qubit processor.",
@@ -53,45 +116,88 @@ DUMMY_NEWS: List[Dict[str, str]] = [
         "description": "A world record was shattered at the international meet, with the athlete setting a new benchmark in track and field.",
         "topics": "sports",
     },
-]
+))
 
+# Index of DUMMY_NEWS by topic, built once so fetch_news does not have
+# to scan the whole list on every request.
+_BY_TOPIC: Dict[str, List[Mapping[str, str]]] = {}
+for _item in DUMMY_NEWS:
+    _BY_TOPIC.setdefault(_item["topics"], []).append(_item)
+del _item
 
+# Dedicated generator for article selection, independent of the global
+# `random` state that other code may seed or consume.
+_RNG = random.Random()
+
+
+@functools.lru_cache(maxsize=None)
 def has_ollama() -> bool:
-    """Check if the `ollama` binary is available in PATH."""
-    return bool(shutil.which("ollama"))
+    """Check whether an ollama server should be used.
+
+    An explicitly configured `OLLAMA_URL` is trusted as is, since the
+    server may run on another host without a local binary. Otherwise
+    the default local server is assumed only if the `ollama` binary is
+    available in PATH. The result is cached for the lifetime of the
+    process, since `shutil.which` walks every PATH entry on each call.
+    """
+    return "OLLAMA_URL" in os.environ or bool(shutil.which("ollama"))
+
 
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(base_url=OLLAMA_URL, timeout=30.0)
+    return _client
 
-def call_ollama(model: str, prompt: str) -> Optional[str]:
-    """Invoke the local ollama model with the provided prompt.
 
-    This function calls `ollama run` with the given model and feeds the
-    prompt to standard input. If `ollama` is not available or an
-    error occurs, it returns None.
+async def close_client() -> None:
+    """Close the shared ollama HTTP client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def call_ollama_async(model: str, prompt: str) -> Optional[str]:
+    """Generate a completion from the local ollama server.
+
+    The prompt is posted to ollama's `/api/generate` endpoint, which
+    keeps the model loaded between calls. If no ollama server is
+    configured or the request fails, it returns None.
     """
-    # Avoid blocking if ollama isn't installed. We use shutil.which to
-    # determine availability.
-    import shutil
-    if not shutil.which("ollama"):
+    # Avoid a pointless connection attempt if no server is configured.
+    if not has_ollama():
         return None
     try:
-        # The command prints the generated text to stdout.
-        # We'll read the output and return it as a string. We limit
-        # output length to avoid long responses.
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=prompt.encode(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=30,
+        response = await _get_client().post(
+            "/api/generate",
+            json={"model": model, "prompt": prompt, "stream": False},
         )
-        if result.returncode == 0:
-            return result.stdout.decode().strip()
-    except Exception:
-        pass
-    return None
+        response.raise_for_status()
+        body = response.json()
+    except (httpx.HTTPError, ValueError) as exc:
+        logger.warning("ollama call failed: %s", exc)
+        return None
+    text = body.get("response") if isinstance(body, dict) else None
+    if not isinstance(text, str):
+        logger.warning("ollama returned an unexpected body: %r", body)
+        return None
+    return text.strip()
+
+
+@functools.lru_cache(maxsize=128)
+def _topic_pool(topics: Tuple[str, ...]) -> Tuple[Mapping[str, str], ...]:
+    """Return the articles matching any of `topics`.
+
+    If none match, all articles are returned. Results are memoised per
+    normalised topic tuple, so repeated requests for popular topics
+    skip the lookup; the random pick itself stays per call.
+    """
+    matches = tuple(itertools.chain.from_iterable(_BY_TOPIC.get(t, ()) for t in topics))
+    return matches or DUMMY_NEWS
 
 
-def fetch_news(topics: str, count: int = 3) -> List[Dict[str, str]]:
+def fetch_news(topics: str, count: int = 3) -> List[Mapping[str, str]]:
     """Select dummy news items matching the requested topics.
 
     Args:
@@ -99,19 +205,73 @@ def fetch_news(topics: str, count: int = 3) -> List[Dict[str, str]]:
         count: The number of items to return.
 
     Returns:
-        A list of dictionaries containing the selected news items.
+        A list of read-only mappings for the selected news items.
+    """
+    requested_topics = tuple(sorted({t.strip().lower() for t in topics.split(",")}))
+    matches = _topic_pool(requested_topics)
+    return _RNG.sample(matches, min(count, len(matches)))
+
+
+def _summary_key(article: Mapping[str, str], preferences: Dict[str, str]) -> str:
+    """Return the summary cache key for an article and preferences.
+
+    Preference values are lower-cased so answers that differ only in
+    case share cached summaries; the prompt itself keeps the original
+    wording.
     """
-    requested_topics = {t.strip().lower() for t in topics.split(",")}
-    # Filter articles that match any of the requested topics. If none
-    # match, return random items.
-    matches = [item for item in DUMMY_NEWS if item["topics"] in requested_topics]
-    if not matches:
-        matches = DUMMY_NEWS[:]
-    random.shuffle(matches)
-    return matches[:count]
+    payload = json.dumps([
+        article["title"],
+        article["description"],
+        article["topics"],
+        preferences.get("tone_of_voice", "formal").lower(),
+        preferences.get("response_format", "paragraphs").lower(),
+        preferences.get("language", "English").lower(),
+        preferences.get("interaction_style", "concise").lower(),
+    ])
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
 
 
-def adapt_article(article: Dict[str, str], preferences: Dict[str, str]) -> str:
+def _cache_get(key: str) -> Optional[str]:
+    summary = _summary_cache.get(key)
+    if summary is not None:
+        _summary_cache.move_to_end(key)
+    return summary
+
+
+def _cache_put(key: str, summary: str) -> None:
+    _summary_cache[key] = summary
+    _summary_cache.move_to_end(key)
+    while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+        _summary_cache.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class _FallbackStyle:
+    """Formatting switches for the fallback summary, derived once per request."""
+
+    bullets: bool
+    detailed: bool
+    enthusiastic: bool
+
+
+def _fallback_style(preferences: Dict[str, str]) -> _FallbackStyle:
+    """Derive the fallback formatting switches from the preferences.
+
+    This is the only place the answers are lower-cased for matching, so
+    callers compute it once per request rather than per article.
+    """
+    return _FallbackStyle(
+        bullets=preferences.get("response_format", "paragraphs").lower().startswith("bullet"),
+        detailed=preferences.get("interaction_style", "concise").lower().startswith("detailed"),
+        enthusiastic=preferences.get("tone_of_voice", "formal").lower().startswith("enthusias"),
+    )
+
+
+async def adapt_article(
+    article: Mapping[str, str],
+    preferences: Dict[str, str],
+    style: Optional[_FallbackStyle] = None,
+) -> str:
     """Produce a summary of an article tailored to user preferences.
 
     This function constructs a prompt to instruct a local model (if
@@ -121,57 +281,149 @@ def adapt_article(article: Dict[str, str], preferences: Dict[str, str]) -> str:
     template that inserts bullet points or paragraphs as requested.
 
     Args:
-        article: A dictionary with keys 'title', 'description' and
+        article: A mapping with keys 'title', 'description' and
             'topics'.
         preferences: A dictionary of collected user preferences.
+        style: Fallback formatting switches. Derived from `preferences`
+            when not given; callers adapting several articles pass it
+            in so it is only computed once.
 
     Returns:
         A string containing the adapted summary.
     """
-    tone = preferences.get("tone_of_voice", "formal")
-    response_format = preferences.get("response_format", "paragraphs")
-    language = preferences.get("language", "English")
-    interaction_style = preferences.get("interaction_style", "concise")
-    title = article["title"]
-    description = article["description"]
-    topics = article["topics"]
+    if style is None:
+        style = _fallback_style(preferences)
+    if not has_ollama():
+        return _fallback_adapt(article, style)
+    # Reuse a previous model summary for the same article and
+    # preferences if there is one.
+    key = _summary_key(article, preferences)
+    summary = _cache_get(key)
+    if summary:
+        return summary
     # Build a prompt instructing the model to summarise and rephrase
     # according to preferences.
-    prompt = (
-        f"You are a helpful assistant tasked with rewriting news articles.\n"
-        f"Please summarise the following news article in {language}.\n"
-        f"Use a {tone} tone and make the summary {interaction_style}.\n"
-        f"Present the response as {response_format}.\n\n"
-        f"Title: {title}\n"
-        f"Description: {description}\n"
-        f"Topics: {topics}\n\n"
-        f"Summary:"
+    prompt = _ARTICLE_PROMPT.format(
+        language=preferences.get("language", "English"),
+        tone=preferences.get("tone_of_voice", "formal"),
+        interaction_style=preferences.get("interaction_style", "concise"),
+        response_format=preferences.get("response_format", "paragraphs"),
+        title=article["title"],
+        description=article["description"],
+        topics=article["topics"],
     )
     # Try to call the local model. If it fails or returns None,
     # generate a naive summary.
-    summary = call_ollama("phi3", prompt)
+    summary = await call_ollama_async("phi3", prompt)
     if summary:
+        _cache_put(key, summary)
         return summary
+    return _fallback_adapt(article, style)
+
+
+def _fallback_adapt(article: Mapping[str, str], style: _FallbackStyle) -> str:
+    """Summarise an article without a model, using simple string rules."""
+    title = article["title"]
+    description = article["description"]
     # Fallback: simple transformation. For bullet points we split the
     # description into clauses.
-    if response_format.lower().startswith("bullet"):
+    if style.bullets:
         # Insert bullet markers (•) for each sentence.
-        sentences = [s.strip() for s in description.split(".") if s.strip()]
-        bullets = [f"• {s.strip()}." for s in sentences]
-        summary_text = "\n".join(bullets)
+        summary_text = "\n".join(
+            f"• {m.group(1)}{m.group(2) or '.'}" for m in _SENTENCE_RE.finditer(description)
+        )
     else:
         summary_text = description
     # Apply interaction style. If detailed, we simply include the title.
-    if interaction_style.lower().startswith("detailed"):
+    if style.detailed:
         summary_text = f"{title}: {summary_text}"
     # Very naive tone adjustment: convert to enthusiastic by adding exclamation.
-    if tone.lower().startswith("enthusias"):
+    if style.enthusiastic:
         summary_text = summary_text.replace(".", "!")
     # No multilingual support in fallback; assume English.
     return summary_text
 
 
-def generate_news_response(preferences: Dict[str, str], count: int = 3) -> str:
+def _split_batch_response(output: str, count: int) -> Optional[List[str]]:
+    """Split a batched model response into per-article summaries.
+
+    Returns None unless every article from 1 to `count` has a non-empty
+    summary, so the caller can fall back to per-article prompts.
+    """
+    parts = _BATCH_ITEM_RE.split(output)
+    # parts is [preamble, index, text, index, text, ...]
+    summaries: Dict[int, str] = {}
+    for index, text in zip(parts[1::2], parts[2::2]):
+        text = text.strip()
+        if text:
+            summaries.setdefault(int(index), text)
+    if any(i not in summaries for i in range(1, count + 1)):
+        return None
+    return [summaries[i] for i in range(1, count + 1)]
+
+
+async def adapt_articles_batch(articles: List[Mapping[str, str]], preferences: Dict[str, str]) -> List[str]:
+    """Summarise several articles with a single model call.
+
+    The preference instructions are sent once, followed by each article
+    labelled `[1]` to `[N]`, and the model is asked to answer with
+    `[i]: <summary>` lines. This costs one model request instead
+    of one per article. Articles with a cached summary are skipped
+    entirely. If the model call fails the string fallback is used
+    directly; if its output cannot be split into `N` summaries, the
+    articles are adapted individually and concurrently with
+    `adapt_article`.
+
+    Args:
+        articles: The articles to summarise.
+        preferences: A dictionary of collected user preferences.
+
+    Returns:
+        One summary per article, in the same order.
+    """
+    # Only articles without a cached summary are sent to the model.
+    keys = [_summary_key(article, preferences) for article in articles]
+    summaries = [_cache_get(key) for key in keys]
+    missing = [i for i, summary in enumerate(summaries) if summary is None]
+    if not missing:
+        return summaries
+    pending = [articles[i] for i in missing]
+    items = "\n\n".join(
+        f"Article [{i}]:\n"
+        f"Title: {article['title']}\n"
+        f"Description: {article['description']}\n"
+        f"Topics: {article['topics']}"
+        for i, article in enumerate(pending, start=1)
+    )
+    prompt = _BATCH_PROMPT.format(
+        language=preferences.get("language", "English"),
+        tone=preferences.get("tone_of_voice", "formal"),
+        interaction_style=preferences.get("interaction_style", "concise"),
+        response_format=preferences.get("response_format", "paragraphs"),
+        items=items,
+    )
+    output = await call_ollama_async("phi3", prompt)
+    style = _fallback_style(preferences)
+    if not output:
+        # The model call itself failed; retrying per article against
+        # the same server would only repeat the failure.
+        fresh = [_fallback_adapt(article, style) for article in pending]
+    else:
+        fresh = _split_batch_response(output, len(pending))
+        if fresh is None:
+            # The server answered but not in the expected form, so it is
+            # worth asking per article. Do so concurrently so the total
+            # latency is that of the slowest call, not the sum of them.
+            fresh = await asyncio.gather(*(adapt_article(article, preferences, style) for article in pending))
+        else:
+            for i, summary in zip(missing, fresh):
+                _cache_put(keys[i], summary)
+    for i, summary in zip(missing, fresh):
+        summaries[i] = summary
+    return summaries
+
+
+async def generate_news_response(preferences: Dict[str, str], count: int = 3) -> str:
     """Generate a combined response with multiple news items.
 
     This returns a formatted string containing the adapted summaries of
@@ -180,6 +432,37 @@ def generate_news_response(preferences: Dict[str, str], count: int = 3) -> str:
     """
     topics = preferences.get("news_topics", "technology")
     articles = fetch_news(topics, count)
-    summaries = [adapt_article(article, preferences) for article in articles]
+    if has_ollama():
+        summaries = await adapt_articles_batch(articles, preferences)
+    else:
+        # Without a model every article takes the fallback path, so skip
+        # building prompts and cache keys altogether.
+        style = _fallback_style(preferences)
+        summaries = [_fallback_adapt(article, style) for article in articles]
     # Concatenate summaries separated by blank lines for readability.
-    return "\n\n".join(summaries)
\ No newline at end of file
+    return "\n\n".join(summaries)
+
+
+async def stream_news_response(preferences: Dict[str, str], count: int = 3) -> AsyncIterator[str]:
+    """Yield adapted news summaries one at a time as they become ready.
+
+    Unlike `generate_news_response`, which waits for every summary and
+    joins them, the articles are adapted individually and concurrently
+    and each summary is yielded as soon as its model call finishes. The
+    first one can be shown without waiting for the rest, so summaries
+    arrive in completion order rather than article order.
+    """
+    articles = fetch_news(preferences.get("news_topics", "technology"), count)
+    style = _fallback_style(preferences)
+    if not has_ollama():
+        for article in articles:
+            yield _fallback_adapt(article, style)
+        return
+    tasks = [asyncio.ensure_future(adapt_article(article, preferences, style)) for article in articles]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Stop outstanding model calls if the consumer goes away early.
+        for task in tasks:
+            task.cancel()
\ No newline at end of file